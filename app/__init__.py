@@ -49,6 +49,13 @@ def create_app():
         if endpoint == "static" and "v" not in values:
             values["v"] = asset_ver
 
+    # Persist compiled template bytecode so a fresh gunicorn worker skips Jinja's
+    # lex/parse step. (Flask already turns template auto-reload off unless debug.)
+    # JINJA_CACHE_DIR unset -> Jinja's private per-user temp directory.
+    from jinja2 import FileSystemBytecodeCache
+
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(os.environ.get("JINJA_CACHE_DIR"))
+
     from app.web.routes import bp
 
     app.register_blueprint(bp)
@@ -2,6 +2,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+import numpy as np
+
 @dataclass
 class Asset:
     """Base class for any asset."""
@@ -23,7 +25,9 @@ class Portfolio:
     stocks: List[Stock] = field(default_factory=list)
     cash: List[Cash] = field(default_factory=list)
 
-@dataclass
+# slots: these are built per position/run and read attribute-by-attribute in
+# the valuation and rendering loops, so skip the per-instance __dict__.
+@dataclass(slots=True)
 class Totals:
     usd: float = 0.0
     twd: float = 0.0
@@ -42,7 +46,7 @@ class Totals:
         self.unrealized_pl_twd = self.twd - self.cost_twd
         self.roi_pct = (self.unrealized_pl_usd / self.cost_usd * 100.0) if self.cost_usd else 0.0
 
-@dataclass
+@dataclass(slots=True)
 class PositionBreakdown:
     name: str
     category: str
@@ -59,7 +63,34 @@ class PositionBreakdown:
     unrealized_pl_twd: float = 0.0
     roi_pct: float = 0.0
 
+@dataclass
+class PositionArrays:
+    """Structure-of-arrays view of the positions, for vectorized filtering/math."""
+    names: np.ndarray
+    categories: np.ndarray
+    value_usd: np.ndarray
+    value_twd: np.ndarray
+    portfolio_pct: np.ndarray
+
+    @classmethod
+    def from_positions(cls, positions: List[PositionBreakdown]) -> PositionArrays:
+        return cls(
+            names=np.array([pos.name for pos in positions], dtype=str),
+            categories=np.array([pos.category for pos in positions], dtype=str),
+            value_usd=np.array([pos.value_usd for pos in positions], dtype=np.float64),
+            value_twd=np.array([pos.value_twd for pos in positions], dtype=np.float64),
+            portfolio_pct=np.array([pos.portfolio_pct for pos in positions], dtype=np.float64),
+        )
+
 @dataclass
 class PortfolioResult:
     totals: Totals
     positions: List[PositionBreakdown]
+    _arrays: Optional[PositionArrays] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def arrays(self) -> PositionArrays:
+        """Column arrays of ``positions``, built once on first use."""
+        if self._arrays is None:
+            self._arrays = PositionArrays.from_positions(self.positions)
+        return self._arrays
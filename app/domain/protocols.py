@@ -79,3 +79,5 @@ class LedgerRepository(Protocol):
     def delete(self, txn_id: int) -> None: ...
 
     def count(self) -> int: ...
+
+    def version(self) -> str: ...
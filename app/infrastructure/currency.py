@@ -0,0 +1,49 @@
+"""Shared offline ECB exchange-rate table (``currencyconverter``).
+
+Building a CurrencyConverter parses the bundled ECB rate history (~0.5 s), so
+the process builds one lazily and every valuation service reuses it.
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+
+from currency_converter import CurrencyConverter
+
+from app.domain.protocols import MarketDataProvider
+from app.infrastructure.market_data import PriceFetchError
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def default_converter() -> CurrencyConverter:
+    return CurrencyConverter(
+        fallback_on_missing_rate=True,
+        fallback_on_wrong_date=True,
+    )
+
+
+def fx_rate(
+    converter: CurrencyConverter,
+    price_provider: MarketDataProvider,
+    source: str,
+    target: str,
+) -> float:
+    """Units of ``target`` per unit of ``source``.
+
+    The offline ECB table answers first; pairs it lacks (e.g. TWD) fall back to
+    the provider's ``{source}{target}=X`` quote.
+    """
+    try:
+        converted = converter.convert(1.0, source, target)
+        if converted is not None:
+            return float(converted)
+    except Exception as exc:  # offline ECB table may lack a pair
+        logger.debug("CurrencyConverter failed (%s -> %s): %s", source, target, exc)
+
+    try:
+        return price_provider.get_price(f"{source}{target}=X")
+    except PriceFetchError as exc:
+        raise PriceFetchError(f"FX conversion {source}->{target} failed") from exc
@@ -7,7 +7,6 @@ counts match the source before the JSON is retired (catches mapping bugs).
 
 from __future__ import annotations
 
-import json
 from collections import defaultdict
 from datetime import date
 from pathlib import Path
@@ -15,6 +14,7 @@ from typing import Dict, List, Union
 
 from app.domain.protocols import LedgerRepository
 from app.domain.transactions import CASH_SYMBOL, Transaction, TxnType
+from app.infrastructure import serialization
 
 # The original JSON has no acquisition dates; seed everything at one early date.
 DEFAULT_IMPORT_DATE = date(2020, 1, 1)
@@ -110,8 +110,7 @@ def import_portfolio_json(
 ) -> Dict:
     """Load portfolio.json, verify, and append seed transactions to the ledger."""
     path = Path(path)
-    with path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+    data = serialization.loads(path.read_bytes())
 
     txns = transactions_from_portfolio_dict(data, trade_date)
     errors = verify_import(data, txns)
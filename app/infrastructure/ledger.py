@@ -106,6 +106,14 @@ class SqliteLedger:
         row = self._conn.execute("SELECT COUNT(*) AS n FROM transactions").fetchone()
         return int(row["n"])
 
+    def version(self) -> str:
+        """Cheap change stamp: rows are only added or deleted, and AUTOINCREMENT
+        never reuses ids, so (count, max id) changes whenever the ledger does."""
+        row = self._conn.execute(
+            "SELECT COUNT(*) AS n, COALESCE(MAX(id), 0) AS last FROM transactions"
+        ).fetchone()
+        return f"{row['n']}:{row['last']}"
+
     def close(self) -> None:
         self._conn.close()
 
@@ -3,22 +3,45 @@
 from __future__ import annotations
 
 import concurrent.futures
-import json
 import logging
+import os
 import time
 from dataclasses import dataclass, field
-from io import StringIO
 from pathlib import Path
 from typing import Dict, Optional, Set, List
 
-import pandas as pd
 import requests
-import yfinance as yf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.infrastructure import serialization
 
 logger = logging.getLogger(__name__)
 
 STOOQ_URL = "https://stooq.com/q/d/l/"
 TWSE_URL = "https://mis.twse.com.tw/stock/api/getStockInfo.jsp"
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+# Yahoo and TWSE throttle non-browser User-Agents; override the session default.
+BROWSER_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Shared keep-alive pool for every source (Yahoo, Stooq, TWSE), sized for the
+# concurrent prefetch in get_prices, so repeat requests to the same host skip
+# the TCP + TLS handshake. Transient throttling/5xx answers get two quick retries.
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": "portfolio-tracker/1.0", "Connection": "keep-alive"})
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        ),
+    ),
+)
 
 
 class PriceFetchError(RuntimeError):
@@ -39,8 +62,72 @@ class PriceFetcher:
     _cache: Dict[str, tuple[float, float]] = field(default_factory=dict, init=False)
     cache_ttl_seconds: int = 300  # 5 minutes
 
+    # Optional on-disk copy of the *online* quotes in _cache (same TTL), so short
+    # back-to-back CLI runs skip the network. None disables it (the web app keeps
+    # one long-lived fetcher, for which the in-memory cache is enough).
+    cache_path: Optional[Path] = None
+    _disk_entries: Dict[str, tuple[float, float]] = field(default_factory=dict, init=False)
+    _disk_dirty: bool = field(default=False, init=False)
+    # Symbols whose current _cache entry was read from disk at startup.
+    _disk_loaded: Set[str] = field(default_factory=set, init=False)
+    disk_cache_used: Set[str] = field(default_factory=set, init=False)
+
+    # Long-lived fetch pool: the dashboard prices the portfolio on every request,
+    # so reusing idle workers beats spawning a fresh set of threads each time.
+    max_workers: int = 10
+    _executor: concurrent.futures.ThreadPoolExecutor = field(init=False, repr=False)
+
     def __post_init__(self) -> None:
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="price-fetch"
+        )
         self._load_overrides()
+        self._load_disk_cache()
+
+    def _load_disk_cache(self) -> None:
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            entries = serialization.loads(self.cache_path.read_bytes())
+            now = time.time()
+            for symbol, (price, timestamp) in entries.items():
+                if now - float(timestamp) < self.cache_ttl_seconds:
+                    self._disk_entries[str(symbol)] = (float(price), float(timestamp))
+        except Exception as exc:
+            logger.warning("Ignoring unreadable price cache %s: %s", self.cache_path, exc)
+            self._disk_entries = {}
+            return
+        self._cache.update(self._disk_entries)
+        self._disk_loaded = set(self._disk_entries)
+        logger.info("Loaded %d cached prices from %s", len(self._disk_entries), self.cache_path)
+
+    def _save_disk_cache(self) -> None:
+        """Atomically rewrite the on-disk cache if new online quotes arrived."""
+        if self.cache_path is None or not self._disk_dirty:
+            return
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(serialization.dumps(self._disk_entries))
+            os.replace(tmp_path, self.cache_path)
+            self._disk_dirty = False
+        except OSError as exc:
+            logger.warning("Failed to write price cache %s: %s", self.cache_path, exc)
+
+    def _remember_online(self, symbol: str, price: float) -> None:
+        entry = (price, time.time())
+        self._cache[symbol] = entry
+        self._disk_loaded.discard(symbol)
+        if self.cache_path is not None:
+            self._disk_entries[symbol] = entry
+            self._disk_dirty = True
+
+    def _cached_price(self, symbol: str) -> Optional[float]:
+        entry = self._cache.get(symbol)
+        if entry is None or time.time() - entry[1] >= self.cache_ttl_seconds:
+            return None
+        if symbol in self._disk_loaded:
+            self.disk_cache_used.add(symbol)
+        return entry[0]
 
     def _load_overrides(self) -> None:
         if not self.overrides_path.exists():
@@ -48,8 +135,7 @@ class PriceFetcher:
             self._overrides = {}
             return
         try:
-            with self.overrides_path.open("r", encoding="utf-8") as handle:
-                overrides = json.load(handle)
+            overrides = serialization.loads(self.overrides_path.read_bytes())
             self._overrides = {
                 str(symbol): float(value) for symbol, value in overrides.items()
             }
@@ -73,16 +159,16 @@ class PriceFetcher:
         fail — a live tracker must not let a stale manual price mask the market.
         """
         # Check cache first
-        if symbol in self._cache:
-            price, timestamp = self._cache[symbol]
-            if time.time() - timestamp < self.cache_ttl_seconds:
-                logger.debug("Using cached price for %s: %.4f", symbol, price)
-                return price
+        price = self._cached_price(symbol)
+        if price is not None:
+            logger.debug("Using cached price for %s: %.4f", symbol, price)
+            return price
 
         if self.allow_online:
             price = self._fetch_online(symbol)
             if price is not None:
-                self._cache[symbol] = (price, time.time())
+                self._remember_online(symbol, price)
+                self._save_disk_cache()
                 return price
 
         # Fallback: manual override only when online is off or failed.
@@ -91,6 +177,7 @@ class PriceFetcher:
             self.overrides_used.add(symbol)
             logger.info("Using fallback override price for %s: %.4f", symbol, price)
             self._cache[symbol] = (price, time.time())
+            self._disk_loaded.discard(symbol)
             return price
 
         raise PriceFetchError(
@@ -104,31 +191,30 @@ class PriceFetcher:
         to_fetch: List[str] = []
 
         for symbol in symbols:
-            if symbol in self._cache:
-                price, timestamp = self._cache[symbol]
-                if time.time() - timestamp < self.cache_ttl_seconds:
-                    results[symbol] = price
-                    continue
+            price = self._cached_price(symbol)
+            if price is not None:
+                results[symbol] = price
+                continue
             if self.allow_online:
                 to_fetch.append(symbol)
             else:
                 self._apply_override(symbol, results)
 
         if to_fetch:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-                future_to_symbol = {
-                    executor.submit(self._fetch_online, symbol): symbol
-                    for symbol in to_fetch
-                }
-                for future in concurrent.futures.as_completed(future_to_symbol):
-                    symbol = future_to_symbol[future]
-                    try:
-                        price = future.result()
-                        if price is not None:
-                            results[symbol] = price
-                            self._cache[symbol] = (price, time.time())
-                    except Exception as exc:
-                        logger.error("Error fetching %s: %s", symbol, exc)
+            future_to_symbol = {
+                self._executor.submit(self._fetch_online, symbol): symbol
+                for symbol in to_fetch
+            }
+            for future in concurrent.futures.as_completed(future_to_symbol):
+                symbol = future_to_symbol[future]
+                try:
+                    price = future.result()
+                    if price is not None:
+                        results[symbol] = price
+                        self._remember_online(symbol, price)
+                except Exception as exc:
+                    logger.error("Error fetching %s: %s", symbol, exc)
+            self._save_disk_cache()
 
             # Fallback to overrides only for symbols online could not price.
             for symbol in to_fetch:
@@ -144,6 +230,7 @@ class PriceFetcher:
             self.overrides_used.add(symbol)
             results[symbol] = price
             self._cache[symbol] = (price, time.time())
+            self._disk_loaded.discard(symbol)
 
     def _fetch_online(self, symbol: str) -> Optional[float]:
         """Try all online sources sequentially."""
@@ -167,12 +254,41 @@ class PriceFetcher:
             
         return None
 
+    @classmethod
+    def _fetch_yahoo(cls, symbol: str) -> Optional[float]:
+        """Fetch price via Yahoo Finance's chart API, falling back to yfinance."""
+        try:
+            response = _SESSION.get(
+                YAHOO_CHART_URL.format(symbol=symbol),
+                params={"range": "1d", "interval": "1d"},
+                headers=BROWSER_HEADERS,
+                timeout=10,
+            )
+            response.raise_for_status()
+            price = cls._parse_yahoo_chart(response.json())
+        except Exception as exc:
+            logger.debug("Yahoo chart API failed for %s: %s", symbol, exc)
+            return cls._fetch_yfinance(symbol)
+        if price is None:
+            logger.debug("Yahoo chart API returned no close for %s", symbol)
+        return price
+
     @staticmethod
-    def _fetch_yahoo(symbol: str) -> Optional[float]:
-        """Fetch price via Yahoo Finance."""
+    def _parse_yahoo_chart(payload: dict) -> Optional[float]:
+        """Latest non-null close from a v8 chart response, or None."""
         try:
-            ticker = yf.Ticker(symbol)
-            history = ticker.history(period="1d")
+            closes = payload["chart"]["result"][0]["indicators"]["quote"][0]["close"]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return next((float(close) for close in reversed(closes or []) if close is not None), None)
+
+    @staticmethod
+    def _fetch_yfinance(symbol: str) -> Optional[float]:
+        """Fallback via yfinance, imported lazily since it drags in pandas."""
+        try:
+            import yfinance as yf
+
+            history = yf.Ticker(symbol).history(period="1d")
             if history.empty or "Close" not in history:
                 logger.debug("Yahoo Finance returned empty history for %s", symbol)
                 return None
@@ -194,20 +310,34 @@ class PriceFetcher:
         stooq_symbol = cls._normalize_symbol(symbol)
         params = {"s": stooq_symbol, "i": "d"}
         try:
-            response = requests.get(STOOQ_URL, params=params, timeout=10)
+            response = _SESSION.get(STOOQ_URL, params=params, timeout=10)
             response.raise_for_status()
-            df = pd.read_csv(StringIO(response.text))
         except Exception as exc:
             logger.debug("Stooq fetch failed for %s: %s", symbol, exc)
             return None
 
-        if df.empty or "Close" not in df:
+        price = cls._parse_stooq_close(response.text)
+        if price is None:
             logger.debug("Stooq returned empty data for %s", symbol)
-            return None
+        return price
 
-        df["Date"] = pd.to_datetime(df["Date"])
-        df.sort_values("Date", inplace=True)
-        return float(df["Close"].iloc[-1])
+    @staticmethod
+    def _parse_stooq_close(text: str) -> Optional[float]:
+        """Close from the last row of Stooq's date-ascending daily CSV.
+
+        Only the header and the final line are split, instead of parsing the
+        whole (often multi-year) history into a DataFrame for one number.
+        """
+        text = text.strip()
+        header, _, body = text.partition("\n")
+        columns = header.strip().split(",")
+        if columns[0] != "Date" or "Close" not in columns or not body:
+            return None
+        fields = text[text.rfind("\n") + 1:].strip().split(",")
+        try:
+            return float(fields[columns.index("Close")])
+        except (IndexError, ValueError):
+            return None
 
     @staticmethod
     def _fetch_twse(symbol: str) -> Optional[float]:
@@ -216,9 +346,8 @@ class PriceFetcher:
             return None
         ticker = symbol.upper().replace(".TW", "")
         params = {"ex_ch": f"tse_{ticker}.tw"}
-        headers = {"User-Agent": "Mozilla/5.0"}
         try:
-            response = requests.get(TWSE_URL, params=params, headers=headers, timeout=5)
+            response = _SESSION.get(TWSE_URL, params=params, headers=BROWSER_HEADERS, timeout=5)
             response.raise_for_status()
             payload = response.json()
         except Exception as exc:
@@ -249,6 +378,11 @@ class PriceFetcher:
             parts.append(
                 "Online sources: " + ", ".join(sorted(self.online_sources_used))
             )
+        if self.disk_cache_used:
+            parts.append(
+                f"Cached ({self.cache_path}) for: "
+                + ", ".join(sorted(self.disk_cache_used))
+            )
         if self.overrides_used:
             parts.append(
                 "Overrides applied for: "
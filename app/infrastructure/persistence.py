@@ -2,15 +2,41 @@
 
 from __future__ import annotations
 
-import json
+import sys
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any
 
+import numpy as np
 import pandas as pd
 
 from app.domain.models import Portfolio, Stock, Cash
+from app.infrastructure import serialization
 
 CSV_COLUMNS = ["date", "total_usd", "total_twd", "daily_return_pct"]
+# Arrow-backed strings keep date comparisons in native code; pyarrow is optional.
+DATE_DTYPE = "string[pyarrow]" if find_spec("pyarrow") is not None else "string"
+# Explicit schema: skips pandas' per-column type inference on every load.
+CSV_DTYPES = {
+    "date": DATE_DTYPE,
+    "total_usd": "float64",
+    "total_twd": "float64",
+    "daily_return_pct": "float64",
+}
+
+def daily_returns_pct(total_usd: np.ndarray) -> np.ndarray:
+    """Day-over-day % change of a date-sorted totals series (first point is 0)."""
+    returns = np.zeros(len(total_usd), dtype=np.float64)
+    if len(total_usd) > 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[1:] = (total_usd[1:] / total_usd[:-1] - 1.0) * 100.0
+        returns[np.isnan(returns)] = 0.0
+    return returns
+
+
+def _format_row(date: str, total_usd: float, total_twd: float, daily_return_pct: float) -> str:
+    """One CSV line: every figure in history.csv is a 2-decimal amount or percent."""
+    return f"{date},{total_usd:.2f},{total_twd:.2f},{daily_return_pct:.2f}\n"
 
 
 class HistoryRepository:
@@ -20,46 +46,98 @@ class HistoryRepository:
         self.path = path
 
     def load(self) -> pd.DataFrame:
-        if self.path.exists():
-            df = pd.read_csv(self.path)
-            if not df.empty and "date" in df.columns:
-                df.sort_values("date", inplace=True)
-            return df
-        return pd.DataFrame(columns=CSV_COLUMNS)
+        if not self.path.exists():
+            return pd.DataFrame(columns=CSV_COLUMNS)
+        df = pd.read_csv(self.path, usecols=CSV_COLUMNS, dtype=CSV_DTYPES, engine="c")
+        # usecols picks the columns but keeps the file's order; callers (and the
+        # positional row writes below) rely on the canonical one.
+        df = df[CSV_COLUMNS]
+        if not df.empty:
+            df.sort_values("date", inplace=True, ignore_index=True)
+        return df
 
     def save(self, df: pd.DataFrame) -> None:
-        df.to_csv(self.path, index=False)
+        # Fixed 4-column numeric layout: plain buffered writes beat to_csv's
+        # dtype-agnostic quoting machinery.
+        rows = zip(
+            df["date"].to_numpy(dtype=str, na_value=""),
+            *(df[column].to_numpy(dtype=np.float64) for column in CSV_COLUMNS[1:]),
+        )
+        with self.path.open("w", encoding="utf-8", newline="") as handle:
+            handle.write(",".join(CSV_COLUMNS) + "\n")
+            handle.writelines(_format_row(*row) for row in rows)
 
     def upsert(
         self, record_date: str, total_usd: float, total_twd: float
     ) -> pd.DataFrame:
         df = self.load()
-        new_row = {
+        new_row = self._row(record_date, total_usd, total_twd)
+        if self._is_appendable(df, record_date):
+            return self._append(df, new_row)
+        df = self._merge(df, new_row)
+        self.save(df)
+        return df
+
+    def preview(
+        self, record_date: str, total_usd: float, total_twd: float
+    ) -> pd.DataFrame:
+        """The frame ``upsert`` would produce, without writing it (dry runs)."""
+        return self._merge(self.load(), self._row(record_date, total_usd, total_twd))
+
+    @staticmethod
+    def _row(record_date: str, total_usd: float, total_twd: float) -> Dict[str, Any]:
+        return {
             "date": record_date,
             "total_usd": round(total_usd, 2),
             "total_twd": round(total_twd, 2),
             "daily_return_pct": 0.0,
         }
 
-        if record_date in df["date"].values:
-            df.loc[df["date"] == record_date, ["total_usd", "total_twd"]] = [
+    def _merge(self, df: pd.DataFrame, new_row: Dict[str, Any]) -> pd.DataFrame:
+        """Update the row for ``new_row``'s date in place, or add it, then re-derive returns."""
+        # One comparison pass serves both the membership test and the update.
+        matches = (df["date"] == new_row["date"]).to_numpy(dtype=bool, na_value=False)
+        if matches.any():
+            df.loc[matches, ["total_usd", "total_twd"]] = [
                 new_row["total_usd"],
                 new_row["total_twd"],
             ]
         else:
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-
-        df = self._recalculate_returns(df)
-        self.save(df)
+            # Assign by label so the row lands right whatever the column order.
+            df.loc[len(df)] = pd.Series(new_row)
+        return self._recalculate_returns(df)
+
+    def _is_appendable(self, df: pd.DataFrame, record_date: str) -> bool:
+        """A new date after the last row only touches the tail of the file.
+
+        The line is written in CSV_COLUMNS order, so the file's own header must
+        match it; a hand-edited layout takes the full rewrite instead.
+        """
+        if df.empty or record_date <= str(df["date"].iloc[-1]):
+            return False
+        with self.path.open("r", encoding="utf-8") as handle:
+            return handle.readline().strip().split(",") == CSV_COLUMNS
+
+    def _append(self, df: pd.DataFrame, new_row: Dict[str, Any]) -> pd.DataFrame:
+        """Write one line instead of re-serializing the whole history."""
+        prev_usd = float(df["total_usd"].iloc[-1])
+        new_row["daily_return_pct"] = float(
+            daily_returns_pct(np.array([prev_usd, new_row["total_usd"]]))[1]
+        )
+        with self.path.open("rb+") as handle:
+            handle.seek(-1, 2)
+            # A hand-edited file may lack the trailing newline save() writes.
+            prefix = b"" if handle.read(1) == b"\n" else b"\n"
+            line = _format_row(*(new_row[column] for column in CSV_COLUMNS))
+            handle.write(prefix + line.encode("utf-8"))
+        df.loc[len(df)] = [new_row[column] for column in CSV_COLUMNS]
         return df
 
     @staticmethod
     def _recalculate_returns(df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        df["date"] = pd.to_datetime(df["date"])
-        df.sort_values("date", inplace=True)
-        df["daily_return_pct"] = df["total_usd"].pct_change().fillna(0.0) * 100.0
-        df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+        # ISO-8601 date strings sort chronologically as-is: no datetime round-trip.
+        df = df.sort_values("date", kind="mergesort", ignore_index=True)
+        df["daily_return_pct"] = daily_returns_pct(df["total_usd"].to_numpy(dtype=np.float64))
         return df
 
 
@@ -72,13 +150,15 @@ class PortfolioRepository:
     def load(self) -> Portfolio:
         if not self.path.exists():
             raise FileNotFoundError(f"Portfolio file not found: {self.path}")
-        
-        with self.path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            
+
+        data = serialization.loads(self.path.read_bytes())
+
+        # Codes are normalised once here (and interned, so the many downstream
+        # dict lookups and comparisons on them hit the identity fast path);
+        # the valuation code can then use them as-is.
         stocks = [
             Stock(
-                symbol=s["symbol"],
+                symbol=sys.intern(str(s["symbol"]).strip().upper()),
                 shares=float(s["shares"]),
                 average_cost=float(s.get("average_cost", 0.0))
             )
@@ -87,7 +167,7 @@ class PortfolioRepository:
         
         cash = [
             Cash(
-                currency=c["currency"],
+                currency=sys.intern(str(c["currency"]).strip().upper()),
                 amount=float(c["amount"])
             )
             for c in data.get("cash", [])
@@ -113,6 +193,5 @@ class PortfolioRepository:
                 for c in portfolio.cash
             ]
         }
-        
-        with self.path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+
+        self.path.write_bytes(serialization.dumps(data, indent=True, newline=True))
@@ -0,0 +1,38 @@
+"""JSON (de)serialization with an optional orjson fast path.
+
+orjson parses straight from bytes and dumps to bytes, several times faster than
+the stdlib. It stays optional: the stdlib fallback keeps the same bytes-in /
+bytes-out shape so callers never branch on which implementation is installed.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:  # Optional speedup; stdlib json is always available as a fallback
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document from bytes (preferred) or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False, newline: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes.
+
+    ``indent`` pretty-prints with 2 spaces; ``newline`` appends a trailing
+    newline so files written from it end like any other text file.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+    text = json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+    return (text + "\n" if newline else text).encode("utf-8")
@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, List, Set, Tuple
 
-from currency_converter import CurrencyConverter
+import numpy as np
 
 from app.domain.models import (
     Portfolio,
@@ -15,46 +15,74 @@ from app.domain.models import (
     Stock,
     Cash
 )
-from app.infrastructure.market_data import PriceFetchError, PriceFetcher
+from app.infrastructure.currency import default_converter, fx_rate
+from app.infrastructure.market_data import PriceFetcher
 
 logger = logging.getLogger(__name__)
 
+# Taiwan listings quote in TWD: .TW (TWSE) and .TWO (TPEx/OTC).
+TW_SUFFIXES = (".TW", ".TWO")
+
+# Per-holding arrays produced by value_stock_arrays, in this order.
+StockArrays = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def value_stock_arrays(
+    shares: np.ndarray,
+    price: np.ndarray,
+    average_cost: np.ndarray,
+    is_twd: np.ndarray,
+    twd_to_usd: float,
+    usd_to_twd: float,
+) -> StockArrays:
+    """Vectorized valuation of every holding in one pass.
+
+    Prices/costs are in each listing's native currency (TWD for TW listings,
+    USD otherwise); ``is_twd`` selects the conversion branch per row with a mask
+    instead of a Python if. Returns value/cost/P&L in USD and TWD plus ROI %.
+    """
+    value_native = price * shares
+    cost_native = average_cost * shares
+    value_usd = np.where(is_twd, value_native * twd_to_usd, value_native)
+    value_twd = np.where(is_twd, value_native, value_native * usd_to_twd)
+    cost_usd = np.where(is_twd, cost_native * twd_to_usd, cost_native)
+    cost_twd = np.where(is_twd, cost_native, cost_native * usd_to_twd)
+    pl_usd = value_usd - cost_usd
+    pl_twd = value_twd - cost_twd
+    roi_pct = np.divide(pl_usd, cost_usd, out=np.zeros_like(pl_usd), where=cost_usd != 0) * 100.0
+    return value_usd, value_twd, cost_usd, cost_twd, pl_usd, pl_twd, roi_pct
+
 
 class PortfolioService:
     """Calculate portfolio totals with currency conversion."""
 
     def __init__(self, price_fetcher: PriceFetcher) -> None:
         self.price_fetcher = price_fetcher
-        self.converter = CurrencyConverter(
-            fallback_on_missing_rate=True,
-            fallback_on_wrong_date=True,
-        )
+        self.converter = default_converter()
+        # FX rate per (source, target), resolved once per calculate() run.
+        self._rates: Dict[Tuple[str, str], float] = {}
 
     def calculate(self, portfolio: Portfolio) -> PortfolioResult:
         totals = Totals()
-        positions: List[PositionBreakdown] = []
-        
-        # Collect all symbols to fetch
-        stock_symbols = [s.symbol for s in portfolio.stocks]
-        # Cash currencies also need rates (e.g. USD=X, TWD=X, or pairs like USDTWD=X)
-        # The current implementation of _convert uses get_price internally.
-        # To fully optimize, we should pre-fetch currency pairs too.
-        # For now, let's optimize stocks first as they are the main latency source.
-        
-        prices = self.price_fetcher.get_prices(stock_symbols)
-        
-        for stock in portfolio.stocks:
-            # Pass pre-fetched price to _value_stock if possible, or let it use cache
-            # Since we populated the cache in get_prices, _value_stock calling get_price 
-            # will hit the cache instantly.
-            usd, twd, cost_usd, cost_twd, breakdown = self._value_stock(stock)
-            totals.add(usd, twd, cost_usd, cost_twd)
-            positions.append(breakdown)
+        self._rates = {}
 
-        for cash in portfolio.cash:
-            usd, twd, cost_usd, cost_twd, breakdown = self._value_cash(cash)
-            totals.add(usd, twd, cost_usd, cost_twd)
-            positions.append(breakdown)
+        # Classify each holding once; the FX prescan and valuation both reuse it.
+        is_twd = np.array(
+            [s.symbol.endswith(TW_SUFFIXES) for s in portfolio.stocks], dtype=bool
+        )
+        # One concurrent batch for every quote the valuation needs: the holdings
+        # plus one quote per FX pair the offline ECB table cannot convert (e.g.
+        # TWD). Rates are then fixed for the run, so conversions are a multiply.
+        needed = self._needed_pairs(portfolio, is_twd)
+        symbols = [s.symbol for s in portfolio.stocks]
+        symbols += self._fx_quotes(needed)
+        prices = self.price_fetcher.get_prices(symbols)
+        self._rates = self._resolve_rates(needed, prices)
+
+        positions = self._value_stocks(portfolio.stocks, is_twd, prices)
+        positions += [self._value_cash(cash) for cash in portfolio.cash]
+        for pos in positions:
+            totals.add(pos.value_usd, pos.value_twd, pos.total_cost_usd, pos.total_cost_twd)
 
         total_value_usd = totals.usd or 1.0  # avoid divide-by-zero
         for pos in positions:
@@ -62,50 +90,92 @@ class PortfolioService:
 
         return PortfolioResult(totals=totals, positions=positions)
 
-    def _value_stock(self, stock: Stock) -> Tuple[float, float, float, float, PositionBreakdown]:
-        symbol = stock.symbol
-        shares = stock.shares
-        average_cost = stock.average_cost
-        price = self.price_fetcher.get_price(symbol)
-
-        price_currency = "TWD" if ".TW" in symbol.upper() else "USD"
-        if ".TW" in symbol.upper():
-            value_twd = price * shares
-            value_usd = self._convert(value_twd, "TWD", "USD")
-            
-            total_cost_twd = average_cost * shares
-            total_cost_usd = self._convert(total_cost_twd, "TWD", "USD")
-        else:
-            value_usd = price * shares
-            value_twd = self._convert(value_usd, "USD", "TWD")
-            
-            total_cost_usd = average_cost * shares
-            total_cost_twd = self._convert(total_cost_usd, "USD", "TWD")
-
-        unrealized_pl_usd = value_usd - total_cost_usd
-        unrealized_pl_twd = value_twd - total_cost_twd
-        roi_pct = (unrealized_pl_usd / total_cost_usd * 100.0) if total_cost_usd else 0.0
-
-        breakdown = PositionBreakdown(
-            name=symbol,
-            category="stock",
-            value_usd=value_usd,
-            value_twd=value_twd,
-            portfolio_pct=0.0,
-            quantity=shares,
-            unit_price=price,
-            price_currency=price_currency,
-            average_cost=average_cost,
-            total_cost_usd=total_cost_usd,
-            total_cost_twd=total_cost_twd,
-            unrealized_pl_usd=unrealized_pl_usd,
-            unrealized_pl_twd=unrealized_pl_twd,
-            roi_pct=roi_pct,
+    @staticmethod
+    def _needed_pairs(portfolio: Portfolio, is_twd: np.ndarray) -> Set[Tuple[str, str]]:
+        """Every (source, target) conversion this portfolio will perform."""
+        pairs = set()
+        if is_twd.any():
+            pairs.add(("TWD", "USD"))
+        if not is_twd.all():
+            pairs.add(("USD", "TWD"))
+        for cash in portfolio.cash:
+            pairs.update({(cash.currency, "USD"), (cash.currency, "TWD")})
+        return {(source, target) for source, target in pairs if source != target}
+
+    def _fx_quotes(self, needed: Set[Tuple[str, str]]) -> List[str]:
+        """Quote symbols (``{src}{tgt}=X``) for the pairs the converter lacks.
+
+        A pair and its inverse share one quote, USD-based where USD is a leg
+        (as Yahoo lists majors); the other direction is derived as 1 / rate.
+        """
+        known = self.converter.currencies
+        quotes = set()
+        for source, target in needed:
+            if source in known and target in known:
+                continue
+            if target == "USD":
+                source, target = target, source
+            quotes.add(f"{source}{target}=X")
+        return sorted(quotes)
+
+    def _resolve_rates(
+        self, needed: Set[Tuple[str, str]], prices: Dict[str, float]
+    ) -> Dict[Tuple[str, str], float]:
+        rates: Dict[Tuple[str, str], float] = {}
+        for source, target in sorted(needed):
+            if (source, target) in rates:
+                continue
+            rate, inverse = self._lookup_rate(source, target, prices)
+            rates[(source, target)] = rate
+            rates.setdefault((target, source), inverse)
+        return rates
+
+    def _value_stocks(
+        self, stocks: List[Stock], is_twd: np.ndarray, prices: Dict[str, float]
+    ) -> List[PositionBreakdown]:
+        price_list = []
+        for stock in stocks:
+            price = prices.get(stock.symbol)
+            if price is None:
+                price = self.price_fetcher.get_price(stock.symbol)
+            price_list.append(price)
+
+        # Only resolve the FX legs some holding actually needs.
+        twd_to_usd = self._rates.get(("TWD", "USD"), 0.0)
+        usd_to_twd = self._rates.get(("USD", "TWD"), 0.0)
+        columns = value_stock_arrays(
+            np.array([stock.shares for stock in stocks], dtype=np.float64),
+            np.array(price_list, dtype=np.float64),
+            np.array([stock.average_cost for stock in stocks], dtype=np.float64),
+            is_twd,
+            twd_to_usd,
+            usd_to_twd,
         )
-        return value_usd, value_twd, total_cost_usd, total_cost_twd, breakdown
 
-    def _value_cash(self, cash: Cash) -> Tuple[float, float, float, float, PositionBreakdown]:
-        currency = cash.currency.upper()
+        return [
+            PositionBreakdown(
+                name=stock.symbol,
+                category="stock",
+                value_usd=value_usd,
+                value_twd=value_twd,
+                portfolio_pct=0.0,
+                quantity=stock.shares,
+                unit_price=price,
+                price_currency="TWD" if twd else "USD",
+                average_cost=stock.average_cost,
+                total_cost_usd=cost_usd,
+                total_cost_twd=cost_twd,
+                unrealized_pl_usd=pl_usd,
+                unrealized_pl_twd=pl_twd,
+                roi_pct=roi_pct,
+            )
+            for stock, price, twd, value_usd, value_twd, cost_usd, cost_twd, pl_usd, pl_twd, roi_pct in zip(
+                stocks, price_list, is_twd.tolist(), *(column.tolist() for column in columns)
+            )
+        ]
+
+    def _value_cash(self, cash: Cash) -> PositionBreakdown:
+        currency = cash.currency
         amount = cash.amount
         value_usd = self._convert(amount, currency, "USD")
         value_twd = self._convert(amount, currency, "TWD")
@@ -130,22 +200,20 @@ class PortfolioService:
             unrealized_pl_twd=0.0,
             roi_pct=0.0,
         )
-        return value_usd, value_twd, cost_usd, cost_twd, breakdown
+        return breakdown
 
     def _convert(self, amount: float, source: str, target: str) -> float:
-        if source == target:
-            return amount
-        try:
-            converted = self.converter.convert(amount, source, target)
-            if converted is not None:
-                return float(converted)
-        except Exception as exc:
-            logger.debug("CurrencyConverter failed (%s -> %s): %s", source, target, exc)
-
-        pair = f"{source}{target}=X"
-        try:
-            rate = self.price_fetcher.get_price(pair)
-        except PriceFetchError as exc:
-            raise PriceFetchError(f"FX conversion {source}->{target} failed") from exc
-
-        return amount * rate
+        return amount if source == target else amount * self._rates[(source, target)]
+
+    def _lookup_rate(
+        self, source: str, target: str, prices: Dict[str, float]
+    ) -> Tuple[float, float]:
+        """Rate for source -> target and its inverse, from a single quote."""
+        direct = prices.get(f"{source}{target}=X")
+        if direct:
+            return direct, 1.0 / direct
+        inverse = prices.get(f"{target}{source}=X")
+        if inverse:
+            return 1.0 / inverse, inverse
+        rate = fx_rate(self.converter, self.price_fetcher, source, target)
+        return rate, 1.0 / rate
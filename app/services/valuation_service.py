@@ -8,20 +8,19 @@ app": real cost basis + P&L instead of the old mutable snapshot.
 
 from __future__ import annotations
 
-import logging
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from currency_converter import CurrencyConverter
 
 from app.domain.positions import Position
 from app.domain.models import PortfolioResult, PositionBreakdown, Totals
 from app.domain.protocols import LedgerRepository, MarketDataProvider
-from app.infrastructure.market_data import PriceFetchError
+from app.infrastructure.currency import default_converter, fx_rate
 from app.services.cost_basis import build_positions
 
-logger = logging.getLogger(__name__)
-
 _CASH_CATEGORY = "cash"
+# (source, target) -> units of target per unit of source.
+Rates = Dict[Tuple[str, str], float]
 _STOCK_CATEGORY = "stock"
 
 
@@ -36,12 +35,13 @@ class ValuationService:
     ) -> None:
         self.ledger = ledger
         self.price_provider = price_provider
-        self.converter = converter or CurrencyConverter(
-            fallback_on_missing_rate=True,
-            fallback_on_wrong_date=True,
-        )
+        self.converter = converter or default_converter()
 
     def value(self) -> PortfolioResult:
+        # FX rate per (source, target), fixed for this run; every row converts
+        # USD<->TWD, so this turns N lookups into one. Kept local because the
+        # one shared service is called from several request threads at once.
+        rates: Rates = {}
         state = build_positions(self.ledger.all())
         totals = Totals()
         positions: List[PositionBreakdown] = []
@@ -55,14 +55,14 @@ class ValuationService:
             price = prices.get(pos.symbol)
             if price is None:
                 price = pos.average_cost
-            breakdown, usd, twd, cost_usd, cost_twd = self._value_position(pos, price)
+            breakdown, usd, twd, cost_usd, cost_twd = self._value_position(pos, price, rates)
             totals.add(usd, twd, cost_usd, cost_twd)
             positions.append(breakdown)
 
         for currency, amount in sorted(state.cash.items()):
             if abs(amount) < 1e-9:
                 continue
-            breakdown, usd, twd, cost_usd, cost_twd = self._value_cash(currency, amount)
+            breakdown, usd, twd, cost_usd, cost_twd = self._value_cash(currency, amount, rates)
             totals.add(usd, twd, cost_usd, cost_twd)
             positions.append(breakdown)
 
@@ -73,19 +73,19 @@ class ValuationService:
         return PortfolioResult(totals=totals, positions=positions)
 
     def _value_position(
-        self, pos: Position, price: float
+        self, pos: Position, price: float, rates: Rates
     ) -> Tuple[PositionBreakdown, float, float, float, float]:
         currency = pos.currency
         if currency == "TWD":
             value_twd = price * pos.quantity
-            value_usd = self._convert(value_twd, "TWD", "USD")
+            value_usd = self._convert(value_twd, "TWD", "USD", rates)
             cost_twd = pos.total_cost
-            cost_usd = self._convert(cost_twd, "TWD", "USD")
+            cost_usd = self._convert(cost_twd, "TWD", "USD", rates)
         else:
             value_usd = price * pos.quantity
-            value_twd = self._convert(value_usd, "USD", "TWD")
+            value_twd = self._convert(value_usd, "USD", "TWD", rates)
             cost_usd = pos.total_cost
-            cost_twd = self._convert(cost_usd, "USD", "TWD")
+            cost_twd = self._convert(cost_usd, "USD", "TWD", rates)
 
         unrealized_pl_usd = value_usd - cost_usd
         unrealized_pl_twd = value_twd - cost_twd
@@ -110,10 +110,10 @@ class ValuationService:
         return breakdown, value_usd, value_twd, cost_usd, cost_twd
 
     def _value_cash(
-        self, currency: str, amount: float
+        self, currency: str, amount: float, rates: Rates
     ) -> Tuple[PositionBreakdown, float, float, float, float]:
-        value_usd = self._convert(amount, currency, "USD")
-        value_twd = self._convert(amount, currency, "TWD")
+        value_usd = self._convert(amount, currency, "USD", rates)
+        value_twd = self._convert(amount, currency, "TWD", rates)
         breakdown = PositionBreakdown(
             name=currency,
             category=_CASH_CATEGORY,
@@ -132,19 +132,16 @@ class ValuationService:
         )
         return breakdown, value_usd, value_twd, value_usd, value_twd
 
-    def _convert(self, amount: float, source: str, target: str) -> float:
+    def _convert(self, amount: float, source: str, target: str, rates: Rates) -> float:
         if source == target:
             return amount
-        try:
-            converted = self.converter.convert(amount, source, target)
-            if converted is not None:
-                return float(converted)
-        except Exception as exc:  # offline ECB table may lack a pair
-            logger.debug("CurrencyConverter failed (%s -> %s): %s", source, target, exc)
-
-        pair = f"{source}{target}=X"
-        try:
-            rate = self.price_provider.get_price(pair)
-        except PriceFetchError as exc:
-            raise PriceFetchError(f"FX conversion {source}->{target} failed") from exc
+        rate = rates.get((source, target))
+        if rate is None:
+            # Resolve the USD-based leg (as Yahoo lists majors, e.g. USDTWD=X)
+            # and derive the reverse, so TWD->USD never needs a second fetch.
+            base, quote = (target, source) if target == "USD" else (source, target)
+            forward = fx_rate(self.converter, self.price_provider, base, quote)
+            rates[(base, quote)] = forward
+            rates[(quote, base)] = 1.0 / forward
+            rate = rates[(source, target)]
         return amount * rate
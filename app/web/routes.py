@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
-import math
+import hashlib
+import time
 from dataclasses import asdict
 from datetime import date
 
-import pandas as pd
-from flask import Blueprint, abort, jsonify, redirect, render_template, request, url_for
+import numpy as np
+from flask import (
+    Blueprint,
+    abort,
+    g,
+    jsonify,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 
 from app.dependencies import container
 from app.domain.transactions import CASH_SYMBOL, Transaction, TxnType
@@ -18,6 +29,10 @@ bp = Blueprint("main", __name__)
 
 MAX_HISTORY_POINTS = 90
 
+# Window (seconds) within which a re-rendered dashboard counts as unchanged:
+# live prices have no cheap version stamp, so they are covered by a time bucket.
+DASHBOARD_ETAG_WINDOW = 60
+
 # Chart time-range tab key -> yfinance period for NAV reconstruction.
 NAV_RANGES = {"1w": "5d", "1m": "1mo", "3m": "3mo", "6m": "6mo", "1y": "1y", "2y": "2y"}
 
@@ -28,21 +43,53 @@ ALLOC_PALETTE = [
 ]
 
 
+def _chart_values(series):
+    """Round to 2dp in one vectorized pass; NaN/inf become JSON-safe None."""
+    values = series.astype("float64")
+    values = values.where(np.isfinite(values)).round(2)
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
 def _chart_payload(history_df):
     limited = history_df.tail(MAX_HISTORY_POINTS)
     labels = limited["date"].tolist()
+    totals = _chart_values(limited["total_usd"])
+    returns = _chart_values(limited["daily_return_pct"])
+    return labels, totals, returns
 
-    def clean_val(value):
-        return None if pd.isna(value) or math.isnan(value) or math.isinf(value) else round(value, 2)
 
-    totals = [clean_val(value) for value in limited["total_usd"].tolist()]
-    returns = [clean_val(value) for value in limited["daily_return_pct"].tolist()]
-    return labels, totals, returns
+@bp.before_request
+def _resolve_today():
+    # One "today" per request, so a render straddling midnight still records the
+    # NAV snapshot under the same date it displays.
+    g.today_iso = date.today().isoformat()
+
+
+def _dashboard_etag(record_date: str) -> str:
+    """Validator for the rendered dashboard: changes when any of its inputs can.
+
+    Part of the key is a time bucket, so two renders in one window (e.g. after
+    the price cache expires mid-bucket) may differ: it is only ever sent weak.
+    """
+    bucket = int(time.time() // DASHBOARD_ETAG_WINDOW)
+    key = f"{container.ledger.version()}:{bucket}:{record_date}"
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def _cacheable(response, etag: str):
+    # no-cache = always revalidate: reloads become cheap 304s, yet a ledger edit
+    # shows up on the very next visit instead of after a max-age expires.
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
 
 @bp.route("/")
 def dashboard():
-    record_date = request.args.get("date") or date.today().isoformat()
+    record_date = request.args.get("date") or g.today_iso
+    etag = _dashboard_etag(record_date)
+    if request.if_none_match.contains_weak(etag):
+        return _cacheable(make_response("", 304), etag)
 
     try:
         result = container.valuation_service.value()
@@ -53,7 +100,7 @@ def dashboard():
     # record today's live point. Replaces the old simulated-history hack.
     nav = container.nav_service
     nav.ensure_history()
-    nav.snapshot(result.totals.usd, result.totals.twd, date.today().isoformat())
+    nav.snapshot(result.totals.usd, result.totals.twd, g.today_iso)
     history_df = nav.history()
 
     daily_return = (
@@ -66,20 +113,21 @@ def dashboard():
 
     # Allocation donut is the "股票/ETFs" view — exclude cash, and weight each
     # holding by its share of the stock/ETF total (not the cash-inclusive total).
-    _alloc = sorted(
-        (pos for pos in result.positions if pos.category == "stock" and pos.value_usd > 0),
-        key=lambda pos: pos.value_usd,
-        reverse=True,
-    )
-    _stock_total = sum(pos.value_usd for pos in _alloc) or 1.0
-    allocation_labels = [pos.name for pos in _alloc]
-    allocation_values = [round(pos.value_usd, 2) for pos in _alloc]
-    allocation_data = [round(pos.value_usd / _stock_total * 100, 2) for pos in _alloc]
+    arrays = result.arrays
+    _held = (arrays.categories == "stock") & (arrays.value_usd > 0)
+    _order = np.argsort(-arrays.value_usd[_held], kind="stable")
+    _values = arrays.value_usd[_held][_order]
+    _stock_total = _values.sum() or 1.0
+    allocation_labels = arrays.names[_held][_order].tolist()
+    allocation_values = np.round(_values, 2).tolist()
+    allocation_data = np.round(_values / _stock_total * 100, 2).tolist()
     # Shared palette so the donut, its legend, and the holdings-table row dots all
     # use the same colour per symbol — visually linking allocation to holdings.
-    allocation_colors = {pos.name: ALLOC_PALETTE[i % len(ALLOC_PALETTE)] for i, pos in enumerate(_alloc)}
+    allocation_colors = {
+        name: ALLOC_PALETTE[i % len(ALLOC_PALETTE)] for i, name in enumerate(allocation_labels)
+    }
 
-    return render_template(
+    html = render_template(
         "dashboard.html",
         result=result,
         record_date=record_date,
@@ -106,6 +154,7 @@ def dashboard():
         allocation_palette=ALLOC_PALETTE,
         price_sources=container.price_fetcher.describe_sources(),
     )
+    return _cacheable(make_response(html), etag)
 
 
 @bp.route("/transactions", methods=["GET", "POST"])
@@ -132,7 +181,7 @@ def transactions():
         "transactions.html",
         transactions=txns,
         txn_types=[t.value for t in TxnType],
-        today=date.today().isoformat(),
+        today=g.today_iso,
     )
 
 
@@ -149,8 +198,7 @@ def nav_json():
     df = container.nav_service.series_for(period)
     if df.empty:
         return jsonify({"labels": [], "totals": []})
-    totals = [None if pd.isna(v) else round(float(v), 2) for v in df["total_usd"].tolist()]
-    return jsonify({"labels": df["date"].tolist(), "totals": totals})
+    return jsonify({"labels": df["date"].tolist(), "totals": _chart_values(df["total_usd"])})
 
 
 @bp.route("/capex.json")
@@ -3,14 +3,20 @@
 
 from __future__ import annotations
 
+import io
+import os
 import smtplib
+from contextlib import contextmanager
 from datetime import date
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
+from typing import Iterator
 
 import pandas as pd
 
+from app.infrastructure.persistence import CSV_COLUMNS
+
 # Update these values before running.
 SENDER_EMAIL = "you@example.com"
 RECEIVER_EMAIL = "you@example.com"
@@ -20,36 +26,63 @@ SMTP_PORT = 587
 
 HISTORY_PATH = Path("history.csv")
 
+# The report only shows the last few records, so only the file's tail is parsed.
+TAIL_ROWS = 6
+TAIL_BYTES = 4096
+
+# Column formatters applied by to_string while rendering the recent-history table.
+REPORT_FORMATTERS = {
+    "total_usd": "{:,.2f}".format,
+    "total_twd": "{:,.2f}".format,
+    "daily_return_pct": "{:.2f}%".format,
+}
+
+
+def _read_tail(path: Path) -> pd.DataFrame | None:
+    """Parse the last TAIL_ROWS rows by seeking near EOF; None if unusable."""
+    with path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        handle.seek(max(0, size - TAIL_BYTES))
+        lines = handle.read().splitlines()
+    if size > TAIL_BYTES:
+        lines = lines[1:]  # the seek most likely landed mid-line
+    rows = [line for line in lines if line.strip() and not line.startswith(b"date,")]
+    if not rows:
+        return None
+    try:
+        return pd.read_csv(
+            io.BytesIO(b"\n".join(rows[-TAIL_ROWS:])), names=CSV_COLUMNS, header=None
+        )
+    except (ValueError, pd.errors.ParserError):
+        return None
+
 
 def load_history() -> pd.DataFrame:
     if not HISTORY_PATH.exists():
         raise FileNotFoundError(
             f"{HISTORY_PATH} is missing. Run main.py to generate portfolio history."
         )
-    df = pd.read_csv(HISTORY_PATH)
+    df = _read_tail(HISTORY_PATH)
+    if df is None:
+        df = pd.read_csv(HISTORY_PATH)
     if df.empty:
         raise ValueError("history.csv has no data to report.")
-    df["date"] = pd.to_datetime(df["date"])
-    df.sort_values("date", inplace=True)
+    # ISO-8601 date strings sort chronologically; keep them as strings.
+    df["date"] = df["date"].astype(str)
+    df.sort_values("date", inplace=True, kind="mergesort", ignore_index=True)
     return df
 
 
 def format_report(df: pd.DataFrame) -> str:
     """Build the email body with latest totals and recent history."""
     today = date.today().isoformat()
-    if (df["date"] == pd.to_datetime(today)).any():
-        latest = df[df["date"] == pd.to_datetime(today)].iloc[-1]
-    else:
-        latest = df.iloc[-1]
+    is_today = df["date"] == today
+    latest = df[is_today].iloc[-1] if is_today.any() else df.iloc[-1]
 
-    recent = df.tail(5).copy()
-    recent["date"] = recent["date"].dt.strftime("%Y-%m-%d")
-    recent["total_usd"] = recent["total_usd"].map(lambda v: f"{v:,.2f}")
-    recent["total_twd"] = recent["total_twd"].map(lambda v: f"{v:,.2f}")
-    recent["daily_return_pct"] = recent["daily_return_pct"].map(lambda v: f"{v:.2f}%")
+    recent = df.tail(5)
 
     lines = [
-        f"Portfolio Summary for {latest['date'].strftime('%Y-%m-%d')}",
+        f"Portfolio Summary for {latest['date']}",
         "",
         f"Total USD: ${latest['total_usd']:,.2f}",
         f"Total TWD: NT${latest['total_twd']:,.2f}",
@@ -58,10 +91,56 @@ def format_report(df: pd.DataFrame) -> str:
         "Recent History (last 5 records):",
     ]
 
-    lines.append(recent.to_string(index=False))
+    lines.append(recent.to_string(index=False, formatters=REPORT_FORMATTERS))
     return "\n".join(lines)
 
 
+# Connected + authenticated server shared by every send in this process, so the
+# TLS handshake and AUTH round-trips are paid once rather than per message.
+_smtp: smtplib.SMTP | None = None
+
+
+@contextmanager
+def _smtp_session() -> Iterator[smtplib.SMTP]:
+    """Yield the shared SMTP connection, reconnecting if it has gone stale."""
+    global _smtp
+    if _smtp is not None:
+        try:
+            _smtp.noop()
+        except (smtplib.SMTPException, OSError):
+            _smtp.close()
+            _smtp = None
+    if _smtp is None:
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+        try:
+            server.starttls()
+            server.login(SENDER_EMAIL, EMAIL_PASSWORD)
+        except BaseException:
+            server.close()
+            raise
+        _smtp = server
+    try:
+        yield _smtp
+    except (smtplib.SMTPServerDisconnected, ConnectionError):
+        # Only a dropped link invalidates the session; e.g. a refused
+        # recipient (SMTPRecipientsRefused) leaves it usable.
+        _smtp.close()
+        _smtp = None
+        raise
+
+
+def close_smtp() -> None:
+    """Politely end the shared SMTP connection, if one is open."""
+    global _smtp
+    if _smtp is None:
+        return
+    try:
+        _smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        pass
+    _smtp = None
+
+
 def send_email(body: str) -> None:
     """Send the email via SMTP with TLS."""
     message = MIMEMultipart()
@@ -70,16 +149,17 @@ def send_email(body: str) -> None:
     message["Subject"] = "Daily Portfolio Report"
     message.attach(MIMEText(body, "plain"))
 
-    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-        server.starttls()
-        server.login(SENDER_EMAIL, EMAIL_PASSWORD)
+    with _smtp_session() as server:
         server.sendmail(SENDER_EMAIL, RECEIVER_EMAIL, message.as_string())
 
 
 def main() -> None:
     df = load_history()
     body = format_report(df)
-    send_email(body)
+    try:
+        send_email(body)
+    finally:
+        close_smtp()
     print("Daily report sent successfully.")
 
 
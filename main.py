@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import argparse
 import logging
+import sys
 from datetime import date, datetime
 from pathlib import Path
 
@@ -21,11 +22,15 @@ try:  # Optional rich-based rendering for nicer terminal output
 except ImportError:  # pragma: no cover - fallback to plain text output
     console = None
 
-from app.domain.models import Portfolio, PortfolioResult
+from app.domain.models import Portfolio, PortfolioResult, PositionBreakdown
 from app.infrastructure.market_data import PriceFetchError, PriceFetcher
 from app.infrastructure.persistence import HistoryRepository, PortfolioRepository
 from app.services.portfolio_service import PortfolioService
 
+# Loss/gain colours, indexed by ``bool(value >= 0)`` (False -> 0, True -> 1);
+# the bool() keeps NumPy scalars (np.bool_ is not a valid tuple index) safe.
+PL_STYLES = ("red", "green")
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -54,6 +59,17 @@ def parse_args() -> argparse.Namespace:
         type=str,
         help="Override the date for the history entry (format: YYYY-MM-DD)",
     )
+    parser.add_argument(
+        "--price-cache",
+        type=Path,
+        default=Path(".price_cache.json"),
+        help="Path to the short-lived online price cache (default: .price_cache.json)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch prices online; neither read nor write the price cache.",
+    )
     parser.add_argument(
         "--overrides-only",
         action="store_true",
@@ -106,7 +122,7 @@ def print_summary(
     latest_row = history_df[history_df["date"] == record_date].iloc[-1]
     if console:
         daily_return = latest_row["daily_return_pct"]
-        daily_style = "green" if daily_return >= 0 else "red"
+        daily_style = PL_STYLES[bool(daily_return >= 0)]
         summary = Table.grid(padding=(0, 2))
         summary.add_column(justify="right", style="bold cyan")
         summary.add_column(justify="left")
@@ -117,7 +133,7 @@ def print_summary(
             Text(f"{daily_return:.2f}%", style=daily_style),
         )
         
-        pl_style = "green" if result.totals.unrealized_pl_usd >= 0 else "red"
+        pl_style = PL_STYLES[bool(result.totals.unrealized_pl_usd >= 0)]
         summary.add_row(
             "Unrealized P/L",
             Text(f"${result.totals.unrealized_pl_usd:,.2f} ({result.totals.roi_pct:.2f}%)", style=pl_style),
@@ -146,32 +162,62 @@ def simulate_history(
     record_date: str,
     result: PortfolioResult,
 ) -> pd.DataFrame:
-    history_df = repository.load()
-    history_df = history_df[history_df["date"] != record_date]
-    summary_df = history_df.copy()
-    summary_df = pd.concat(
-        [
-            summary_df,
-            pd.DataFrame(
-                [
-                    {
-                        "date": record_date,
-                        "total_usd": round(result.totals.usd, 2),
-                        "total_twd": round(result.totals.twd, 2),
-                        "daily_return_pct": 0.0,
-                    }
-                ]
-            ),
-        ],
-        ignore_index=True,
+    return repository.preview(record_date, result.totals.usd, result.totals.twd)
+
+
+BREAKDOWN_TITLE = "明細（USD/TWD 已換算）"
+PLAIN_HEADER = (
+    f"{'類型':<8}{'標的/貨幣':<15}{'數量':>10}{'單價':>12}{'幣別':>8}"
+    f"{'價值(USD)':>14}{'價值(TWD)':>14}{'損益(USD)':>14}{'報酬率%':>10}{'佔比%':>10}"
+)
+
+
+def _rich_row(pos: PositionBreakdown) -> tuple:
+    quantity = f"{pos.quantity:.4f}" if pos.quantity is not None else "-"
+    if pos.category == "cash":
+        unit_price = avg_cost = pl_usd = roi = "-"
+        pl_style = ""
+    else:
+        unit_price = f"{pos.unit_price:.4f}" if pos.unit_price is not None else "-"
+        avg_cost = f"{pos.average_cost:.4f}" if pos.average_cost is not None else "-"
+        pl_usd = f"{pos.unrealized_pl_usd:,.2f}"
+        roi = f"{pos.roi_pct:.2f}%"
+        pl_style = PL_STYLES[bool(pos.unrealized_pl_usd >= 0)]
+    return (
+        pos.category,
+        pos.name,
+        quantity,
+        unit_price,
+        pos.price_currency or "-",
+        f"{pos.value_usd:,.2f}",
+        f"{pos.value_twd:,.2f}",
+        avg_cost,
+        Text(pl_usd, style=pl_style),
+        Text(roi, style=pl_style),
+        f"{pos.portfolio_pct:.2f}",
     )
-    summary_df["date"] = pd.to_datetime(summary_df["date"])
-    summary_df.sort_values("date", inplace=True)
-    summary_df["daily_return_pct"] = (
-        summary_df["total_usd"].pct_change().fillna(0.0) * 100.0
+
+
+def _plain_row(pos: PositionBreakdown) -> str:
+    quantity = f"{pos.quantity:.4f}" if pos.quantity is not None else "-"
+    if pos.category == "cash":
+        unit_price = pl_usd = roi = "-"
+    else:
+        unit_price = f"{pos.unit_price:.4f}" if pos.unit_price is not None else "-"
+        pl_usd = f"{pos.unrealized_pl_usd:,.2f}"
+        roi = f"{pos.roi_pct:.2f}%"
+    return (
+        f"{pos.category:<8}"
+        f"{pos.name:<15}"
+        f"{quantity:>10}"
+        f"{unit_price:>12}"
+        f"{(pos.price_currency or '-'):>8}"
+        f"{pos.value_usd:>14.2f}"
+        f"{pos.value_twd:>14.2f}"
+        f"{pl_usd:>14}"
+        f"{roi:>10}"
+        f"{pos.portfolio_pct:>10.2f}"
     )
-    summary_df["date"] = summary_df["date"].dt.strftime("%Y-%m-%d")
-    return summary_df
 
 
 def print_breakdown(result: PortfolioResult) -> None:
@@ -179,7 +225,7 @@ def print_breakdown(result: PortfolioResult) -> None:
         return
     if console:
         table = Table(
-            title="明細（USD/TWD 已換算）",
+            title=BREAKDOWN_TITLE,
             box=box.SIMPLE_HEAVY,
             highlight=True,
         )
@@ -194,70 +240,17 @@ def print_breakdown(result: PortfolioResult) -> None:
         table.add_column("損益(USD)", justify="right")
         table.add_column("報酬率%", justify="right")
         table.add_column("佔比%", justify="right")
-        for pos in result.positions:
-            quantity = f"{pos.quantity:.4f}" if pos.quantity is not None else "-"
-            if pos.category == "cash":
-                unit_price = "-"
-                avg_cost = "-"
-                pl_usd = "-"
-                roi = "-"
-                pl_style = ""
-            else:
-                unit_price = f"{pos.unit_price:.4f}" if pos.unit_price is not None else "-"
-                avg_cost = f"{pos.average_cost:.4f}" if pos.average_cost is not None else "-"
-                pl_usd = f"{pos.unrealized_pl_usd:,.2f}"
-                roi = f"{pos.roi_pct:.2f}%"
-                pl_style = "green" if pos.unrealized_pl_usd >= 0 else "red"
-
-            table.add_row(
-                pos.category,
-                pos.name,
-                quantity,
-                unit_price,
-                pos.price_currency or "-",
-                f"{pos.value_usd:,.2f}",
-                f"{pos.value_twd:,.2f}",
-                avg_cost,
-                Text(pl_usd, style=pl_style),
-                Text(roi, style=pl_style),
-                f"{pos.portfolio_pct:.2f}",
-            )
+        rows = [_rich_row(pos) for pos in result.positions]
+        for row in rows:
+            table.add_row(*row)
         console.print(table)
         console.print()
         return
 
-    print("\n明細（USD/TWD 已換算）：")
-    header = (
-        f"{'類型':<8}{'標的/貨幣':<15}{'數量':>10}{'單價':>12}{'幣別':>8}"
-        f"{'價值(USD)':>14}{'價值(TWD)':>14}{'損益(USD)':>14}{'報酬率%':>10}{'佔比%':>10}"
-    )
-    print(header)
-    print("-" * len(header))
-    for pos in result.positions:
-        quantity = f"{pos.quantity:.4f}" if pos.quantity is not None else "-"
-        if pos.category == "cash":
-            unit_price = "-"
-            pl_usd = "-"
-            roi = "-"
-        else:
-            unit_price = f"{pos.unit_price:.4f}" if pos.unit_price is not None else "-"
-            pl_usd = f"{pos.unrealized_pl_usd:,.2f}"
-            roi = f"{pos.roi_pct:.2f}%"
-
-        line = (
-            f"{pos.category:<8}"
-            f"{pos.name:<15}"
-            f"{quantity:>10}"
-            f"{unit_price:>12}"
-            f"{(pos.price_currency or '-'):>8}"
-            f"{pos.value_usd:>14.2f}"
-            f"{pos.value_twd:>14.2f}"
-            f"{pl_usd:>14}"
-            f"{roi:>10}"
-            f"{pos.portfolio_pct:>10.2f}"
-        )
-        print(line)
-    print()
+    # Build the whole block and write it once instead of a print per row.
+    lines = ["", BREAKDOWN_TITLE + "：", PLAIN_HEADER, "-" * len(PLAIN_HEADER)]
+    lines.extend(_plain_row(pos) for pos in result.positions)
+    sys.stdout.write("\n".join(lines) + "\n\n")
 
 
 def main() -> None:
@@ -267,9 +260,11 @@ def main() -> None:
     record_date = resolve_date(args.date)
     
     # Use dependencies
+    use_cache = not (args.no_cache or args.overrides_only)
     fetcher = PriceFetcher(
         overrides_path=args.overrides,
         allow_online=not args.overrides_only,
+        cache_path=args.price_cache if use_cache else None,
     )
     calculator = PortfolioService(fetcher)
     history_repo = HistoryRepository(args.history)
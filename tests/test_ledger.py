@@ -76,3 +76,12 @@ def test_persists_to_file(tmp_path):
     reopened = SqliteLedger(db)
     assert reopened.count() == 1
     reopened.close()
+
+
+def test_version_changes_on_add_and_delete(ledger):
+    empty = ledger.version()
+    saved = ledger.add(Transaction(TxnType.BUY, "NVDA", date(2026, 1, 2), quantity=1, price=1))
+    added = ledger.version()
+    ledger.delete(saved.id)
+    ledger.add(Transaction(TxnType.BUY, "QQQ", date(2026, 1, 2), quantity=1, price=1))
+    assert len({empty, added, ledger.version()}) == 3
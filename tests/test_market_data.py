@@ -0,0 +1,68 @@
+"""Unit tests for PriceFetcher caching and source parsing (no network)."""
+
+from app.infrastructure.market_data import PriceFetcher
+
+
+def _fetcher(tmp_path, quotes, **kwargs):
+    fetcher = PriceFetcher(overrides_path=tmp_path / "none.json", **kwargs)
+    fetcher._fetch_online = lambda symbol: quotes.get(symbol)
+    return fetcher
+
+
+def test_disk_cache_serves_next_run_without_network(tmp_path):
+    cache = tmp_path / "prices.json"
+    first = _fetcher(tmp_path, {"NVDA": 150.0, "QQQ": 500.0}, cache_path=cache)
+    assert first.get_prices(["NVDA", "QQQ"]) == {"NVDA": 150.0, "QQQ": 500.0}
+    assert cache.exists()
+
+    second = _fetcher(tmp_path, {}, cache_path=cache)
+    assert second.get_price("NVDA") == 150.0
+    assert second.disk_cache_used == {"NVDA"}
+
+
+def test_online_quotes_are_not_reported_as_disk_hits(tmp_path):
+    fetcher = _fetcher(tmp_path, {"NVDA": 150.0}, cache_path=tmp_path / "prices.json")
+    fetcher.get_prices(["NVDA"])
+    assert fetcher.get_price("NVDA") == 150.0
+    assert fetcher.disk_cache_used == set()
+    assert "Cached" not in fetcher.describe_sources()
+
+
+def test_disk_cache_ignores_expired_entries(tmp_path):
+    cache = tmp_path / "prices.json"
+    cache.write_text('{"NVDA": [150.0, 0.0]}', encoding="utf-8")
+    fetcher = _fetcher(tmp_path, {"NVDA": 151.0}, cache_path=cache)
+    assert fetcher.get_price("NVDA") == 151.0
+    assert fetcher.disk_cache_used == set()
+
+
+def test_without_cache_path_nothing_is_written(tmp_path):
+    fetcher = _fetcher(tmp_path, {"NVDA": 150.0})
+    assert fetcher.get_price("NVDA") == 150.0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parse_stooq_close_reads_last_row():
+    text = (
+        "Date,Open,High,Low,Close,Volume\r\n"
+        "2026-01-02,10,11,9,10.5,100\r\n"
+        "2026-01-05,10.5,12,10,11.75,120\r\n"
+    )
+    assert PriceFetcher._parse_stooq_close(text) == 11.75
+
+
+def test_parse_stooq_close_rejects_empty_or_malformed():
+    assert PriceFetcher._parse_stooq_close("No data") is None
+    assert PriceFetcher._parse_stooq_close("Date,Open,High,Low,Close,Volume\n") is None
+    assert PriceFetcher._parse_stooq_close("Date,Open,High,Low,Close\n2026-01-02,1,2") is None
+
+
+def test_parse_yahoo_chart_skips_trailing_nulls():
+    payload = {"chart": {"result": [{"indicators": {"quote": [{"close": [101.5, 102.25, None]}]}}]}}
+    assert PriceFetcher._parse_yahoo_chart(payload) == 102.25
+
+
+def test_parse_yahoo_chart_rejects_errors_and_empty_series():
+    assert PriceFetcher._parse_yahoo_chart({"chart": {"result": None, "error": {}}}) is None
+    assert PriceFetcher._parse_yahoo_chart({"chart": {"result": [{"indicators": {"quote": [{}]}}]}}) is None
+    assert PriceFetcher._parse_yahoo_chart({"chart": {"result": [{"indicators": {"quote": [{"close": [None]}]}}]}}) is None
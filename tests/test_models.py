@@ -0,0 +1,29 @@
+"""Unit tests for the valuation result models."""
+
+from app.domain.models import PortfolioResult, PositionBreakdown, Totals
+
+
+def _pos(name, category, value_usd, pct):
+    return PositionBreakdown(
+        name=name, category=category, value_usd=value_usd, value_twd=value_usd * 32, portfolio_pct=pct
+    )
+
+
+def test_arrays_mirror_positions_column_wise():
+    result = PortfolioResult(
+        totals=Totals(),
+        positions=[_pos("NVDA", "stock", 600.0, 60.0), _pos("USD", "cash", 400.0, 40.0)],
+    )
+    arrays = result.arrays
+    assert arrays.names.tolist() == ["NVDA", "USD"]
+    assert arrays.categories.tolist() == ["stock", "cash"]
+    assert arrays.value_usd.tolist() == [600.0, 400.0]
+    assert arrays.value_twd.tolist() == [19200.0, 12800.0]
+    assert arrays.portfolio_pct.tolist() == [60.0, 40.0]
+    assert result.arrays is arrays
+
+
+def test_arrays_of_empty_result_are_empty():
+    arrays = PortfolioResult(totals=Totals(), positions=[]).arrays
+    assert arrays.names.size == 0
+    assert arrays.value_usd.sum() == 0.0
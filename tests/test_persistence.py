@@ -0,0 +1,146 @@
+"""Unit tests for the CSV history and JSON portfolio repositories."""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.models import Cash, Portfolio, Stock
+from app.infrastructure import persistence, serialization
+from app.infrastructure.persistence import (
+    HistoryRepository,
+    PortfolioRepository,
+    daily_returns_pct,
+)
+
+
+@pytest.fixture(params=["string[python]", "string[pyarrow]"])
+def date_dtype(request, monkeypatch):
+    """Run history tests on both date column storages DATE_DTYPE may pick.
+
+    Plain "string" resolves to pyarrow storage whenever pyarrow is installed,
+    so the fallback is pinned to its python storage explicitly.
+    """
+    if request.param == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setitem(persistence.CSV_DTYPES, "date", request.param)
+    return request.param
+
+
+def test_serialization_roundtrip_is_bytes():
+    payload = {"stocks": [{"symbol": "NVDA", "shares": 67.0}], "cash": []}
+    raw = serialization.dumps(payload, indent=True)
+    assert isinstance(raw, bytes)
+    assert serialization.loads(raw) == payload
+
+
+def test_portfolio_save_load_roundtrip(tmp_path):
+    repo = PortfolioRepository(tmp_path / "portfolio.json")
+    portfolio = Portfolio(
+        stocks=[Stock(symbol="NVDA", shares=67.0, average_cost=188.14)],
+        cash=[Cash(currency="USD", amount=70.64)],
+    )
+    repo.save(portfolio)
+    assert repo.load() == portfolio
+    assert repo.path.read_bytes().endswith(b"}\n")
+
+
+def test_portfolio_load_normalises_codes(tmp_path):
+    path = tmp_path / "portfolio.json"
+    path.write_bytes(
+        serialization.dumps(
+            {
+                "stocks": [{"symbol": " 2330.tw", "shares": 1.0}],
+                "cash": [{"currency": "twd", "amount": 5.0}],
+            }
+        )
+    )
+    portfolio = PortfolioRepository(path).load()
+    assert portfolio.stocks[0].symbol == "2330.TW"
+    assert portfolio.cash[0].currency is sys.intern("TWD")
+
+
+def test_history_upsert_recomputes_returns(tmp_path, date_dtype):
+    repo = HistoryRepository(tmp_path / "history.csv")
+    repo.upsert("2026-01-02", 1000.0, 32000.0)
+    df = repo.upsert("2026-01-03", 1100.0, 35200.0)
+    assert df["date"].tolist() == ["2026-01-02", "2026-01-03"]
+    assert df["daily_return_pct"].iloc[1] == pytest.approx(10.0)
+
+    df = repo.upsert("2026-01-03", 1200.0, 38400.0)
+    assert len(df) == 2
+    assert df["daily_return_pct"].iloc[1] == pytest.approx(20.0)
+
+
+def test_daily_returns_pct_matches_pct_change():
+    totals = np.array([100.0, 110.0, 99.0, 99.0])
+    expected = pd.Series(totals).pct_change().fillna(0.0).to_numpy() * 100.0
+    assert daily_returns_pct(totals) == pytest.approx(expected)
+    assert daily_returns_pct(np.array([5.0])).tolist() == [0.0]
+
+
+def test_history_append_matches_full_rewrite(tmp_path, date_dtype):
+    appended = HistoryRepository(tmp_path / "appended.csv")
+    rewritten = HistoryRepository(tmp_path / "rewritten.csv")
+    for repo in (appended, rewritten):
+        repo.upsert("2026-01-02", 1000.0, 32000.0)
+    # A new latest date takes the append path; an out-of-order one rewrites.
+    appended.upsert("2026-01-03", 1100.0, 35200.0)
+    rewritten.upsert("2026-01-01", 900.0, 28800.0)
+    rewritten.upsert("2026-01-03", 1100.0, 35200.0)
+
+    tail = appended.load().iloc[-1]
+    assert tail["date"] == "2026-01-03"
+    assert tail["daily_return_pct"] == pytest.approx(10.0)
+    assert (tmp_path / "appended.csv").read_text().splitlines()[-1] == (
+        (tmp_path / "rewritten.csv").read_text().splitlines()[-1]
+    )
+
+
+def test_history_save_writes_two_decimal_rows(tmp_path, date_dtype):
+    repo = HistoryRepository(tmp_path / "history.csv")
+    repo.upsert("2026-01-03", 1100.0, 35200.0)
+    repo.upsert("2026-01-02", 1000.5, 32016.0)
+    assert (tmp_path / "history.csv").read_text().splitlines() == [
+        "date,total_usd,total_twd,daily_return_pct",
+        "2026-01-02,1000.50,32016.00,0.00",
+        "2026-01-03,1100.00,35200.00,9.95",
+    ]
+    loaded = repo.load()
+    assert loaded["date"].dtype == date_dtype
+    assert loaded["total_usd"].tolist() == [1000.5, 1100.0]
+
+
+def test_history_preview_matches_upsert_without_writing(tmp_path, date_dtype):
+    path = tmp_path / "history.csv"
+    repo = HistoryRepository(path)
+    repo.upsert("2026-01-02", 1000.0, 32000.0)
+    repo.upsert("2026-01-04", 1200.0, 38400.0)
+    before = path.read_bytes()
+
+    preview = repo.preview("2026-01-03", 1100.0, 35200.0)
+    assert path.read_bytes() == before
+    assert preview["date"].tolist() == ["2026-01-02", "2026-01-03", "2026-01-04"]
+    pd.testing.assert_frame_equal(preview, repo.upsert("2026-01-03", 1100.0, 35200.0))
+
+
+def test_history_append_respects_reordered_header(tmp_path, date_dtype):
+    path = tmp_path / "history.csv"
+    path.write_text("date,total_twd,total_usd,daily_return_pct\n2026-01-02,32000.0,1000.0,0.0\n")
+    repo = HistoryRepository(path)
+    df = repo.upsert("2026-01-03", 1100.0, 35200.0)
+    assert df.columns.tolist() == persistence.CSV_COLUMNS
+    assert df["total_usd"].tolist() == [1000.0, 1100.0]
+    assert repo.load()["total_twd"].tolist() == [32000.0, 35200.0]
+
+
+def test_history_merge_assigns_new_rows_by_column_name(tmp_path, date_dtype):
+    repo = HistoryRepository(tmp_path / "history.csv")
+    reordered = pd.DataFrame(
+        {"date": ["2026-01-03"], "total_twd": [35200.0], "total_usd": [1100.0], "daily_return_pct": [0.0]}
+    ).astype({"date": date_dtype})
+    merged = repo._merge(reordered, repo._row("2026-01-02", 1000.0, 32000.0))
+    assert merged["date"].tolist() == ["2026-01-02", "2026-01-03"]
+    assert merged["total_usd"].tolist() == [1000.0, 1100.0]
+    assert merged["total_twd"].tolist() == [32000.0, 35200.0]
@@ -0,0 +1,96 @@
+"""Unit tests for the portfolio.json-based valuation service (CLI path)."""
+
+import numpy as np
+import pytest
+
+from app.domain.models import Cash, Portfolio, Stock
+from app.services.portfolio_service import PortfolioService, value_stock_arrays
+
+
+class RecordingProvider:
+    """Deterministic price source that records how prices were requested."""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.batches = []
+        self.singles = []
+
+    def get_price(self, symbol):
+        self.singles.append(symbol)
+        return self.prices[symbol]
+
+    def get_prices(self, symbols):
+        self.batches.append(list(symbols))
+        return {s: self.prices[s] for s in symbols if s in self.prices}
+
+
+PRICES = {"NVDA": 150.0, "2330.TW": 1000.0, "USDTWD=X": 32.0, "TWDUSD=X": 1 / 32.0}
+
+PORTFOLIO = Portfolio(
+    stocks=[
+        Stock(symbol="NVDA", shares=10, average_cost=100.0),
+        Stock(symbol="2330.TW", shares=64, average_cost=500.0),
+    ],
+    cash=[Cash(currency="USD", amount=500.0)],
+)
+
+
+def test_fetches_holdings_and_fx_pairs_in_one_batch():
+    provider = RecordingProvider(PRICES)
+    PortfolioService(provider).calculate(PORTFOLIO)
+    assert len(provider.batches) == 1
+    assert set(provider.batches[0]) == {"NVDA", "2330.TW", "USDTWD=X"}
+    assert provider.singles == []
+
+
+def test_values_us_and_tw_holdings_with_cash():
+    result = PortfolioService(RecordingProvider(PRICES)).calculate(PORTFOLIO)
+
+    nvda = next(p for p in result.positions if p.name == "NVDA")
+    assert nvda.value_usd == pytest.approx(1500)
+    assert nvda.value_twd == pytest.approx(48000)
+    assert nvda.roi_pct == pytest.approx(50)
+
+    tsmc = next(p for p in result.positions if p.name == "2330.TW")
+    assert tsmc.price_currency == "TWD"
+    assert tsmc.value_twd == pytest.approx(64000)
+    assert tsmc.value_usd == pytest.approx(2000)
+    assert tsmc.total_cost_usd == pytest.approx(1000)
+
+    assert result.totals.usd == pytest.approx(4000)
+    assert result.totals.unrealized_pl_usd == pytest.approx(1500)
+    assert sum(p.portfolio_pct for p in result.positions) == pytest.approx(100)
+
+
+def test_inverse_fx_rate_is_derived_from_the_same_quote():
+    prices = {k: v for k, v in PRICES.items() if k != "TWDUSD=X"}
+    provider = RecordingProvider(prices)
+    result = PortfolioService(provider).calculate(PORTFOLIO)
+    tsmc = next(p for p in result.positions if p.name == "2330.TW")
+    assert tsmc.value_usd == pytest.approx(2000)
+    assert provider.singles == []
+
+
+def test_value_stock_arrays_branches_per_row_and_guards_zero_cost():
+    value_usd, value_twd, cost_usd, _, pl_usd, _, roi = value_stock_arrays(
+        shares=np.array([10.0, 2.0]),
+        price=np.array([150.0, 1000.0]),
+        average_cost=np.array([100.0, 0.0]),
+        is_twd=np.array([False, True]),
+        twd_to_usd=1 / 32.0,
+        usd_to_twd=32.0,
+    )
+    assert value_usd.tolist() == pytest.approx([1500, 62.5])
+    assert value_twd.tolist() == pytest.approx([48000, 2000])
+    assert cost_usd.tolist() == pytest.approx([1000, 0])
+    assert pl_usd.tolist() == pytest.approx([500, 62.5])
+    assert roi.tolist() == pytest.approx([50, 0])
+
+
+def test_otc_listings_are_valued_in_twd():
+    provider = RecordingProvider({**PRICES, "6488.TWO": 500.0})
+    portfolio = Portfolio(stocks=[Stock(symbol="6488.TWO", shares=64, average_cost=400.0)], cash=[])
+    (position,) = PortfolioService(provider).calculate(portfolio).positions
+    assert position.price_currency == "TWD"
+    assert position.value_twd == pytest.approx(32000)
+    assert position.value_usd == pytest.approx(1000)
@@ -14,8 +14,10 @@ class FakeProvider:
 
     def __init__(self, prices):
         self.prices = prices
+        self.singles = []
 
     def get_price(self, symbol):
+        self.singles.append(symbol)
         return self.prices[symbol]
 
     def get_prices(self, symbols):
@@ -78,3 +80,24 @@ def test_missing_price_falls_back_to_average_cost(ledger):
     pos = next(p for p in result.positions if p.name == "ZZZ")
     assert pos.unit_price == pytest.approx(20)
     assert pos.unrealized_pl_usd == pytest.approx(0)
+
+
+def test_fx_rate_is_fetched_once_per_valuation(ledger):
+    ledger.add_many(
+        [
+            Transaction(TxnType.DEPOSIT, CASH_SYMBOL, date(2026, 1, 1), quantity=5000, currency="USD"),
+            Transaction(TxnType.DEPOSIT, CASH_SYMBOL, date(2026, 1, 1), quantity=64000, currency="TWD"),
+            Transaction(TxnType.BUY, "NVDA", date(2026, 1, 2), quantity=10, price=100, currency="USD"),
+            Transaction(TxnType.BUY, "2330.TW", date(2026, 1, 2), quantity=64, price=500, currency="TWD"),
+        ]
+    )
+    provider = FakeProvider({"NVDA": 150, "2330.TW": 1000, "USDTWD=X": 32.0})
+    svc = ValuationService(ledger, provider)
+
+    result = svc.value()
+    tsmc = next(p for p in result.positions if p.name == "2330.TW")
+    assert tsmc.value_usd == pytest.approx(2000)
+    assert provider.singles == ["USDTWD=X"]
+
+    svc.value()
+    assert provider.singles == ["USDTWD=X", "USDTWD=X"]